@@ -54,6 +54,10 @@ def create_app(config_class=Config):
     from app.routes import main as main_blueprint
     app.register_blueprint(main_blueprint)
 
+    # Register custom CLI commands, e.g. `flask seed` for benchmark data.
+    from app.commands import register_commands
+    register_commands(app)
+
     # Note: The upload directories are now created automatically when the
     # `config` module is imported and the `create_upload_directories()`
     # function is run, so we've removed the redundant code here.
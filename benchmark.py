@@ -0,0 +1,359 @@
+"""
+Benchmark harness for the main VidFlow routes.
+
+Seed a data set first, for example:
+
+    flask --app run init-db
+    flask --app run seed --scale 100k
+
+then run:
+
+    python benchmark.py --output bench/results.json
+    python benchmark.py --mode http --gunicorn --output bench/results.json
+    python benchmark.py --mode servers --output bench/servers.json
+
+Each endpoint is timed through the Flask test client and/or over HTTP against
+gunicorn. The JSON report holds p50/p95/p99 latency, SQL queries per request
+and peak Python memory per endpoint. Keys are sorted so two reports from
+different commits can be compared with a plain `diff`.
+
+The "servers" mode starts gunicorn once per worker class (sync, gthread,
+gevent) and reports startup time and throughput under concurrent load.
+"""
+import argparse
+import http.cookiejar
+import importlib.util
+import json
+import math
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import event, func
+
+from app import create_app, db
+from app.commands import SEED_PASSWORD
+from app.models import User, Post, followers
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+
+
+def _percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = math.ceil(percent / 100 * len(sorted_values)) - 1
+    return sorted_values[min(max(index, 0), len(sorted_values) - 1)]
+
+
+def _summarize(timings_ms):
+    timings_ms = sorted(timings_ms)
+    return {
+        'samples': len(timings_ms),
+        'p50_ms': round(_percentile(timings_ms, 50), 3),
+        'p95_ms': round(_percentile(timings_ms, 95), 3),
+        'p99_ms': round(_percentile(timings_ms, 99), 3),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=basedir,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def resolve_targets(app, username, profile_username):
+    """
+    Picks the accounts to benchmark with when they aren't given explicitly:
+    the most followed user's profile, viewed by one of their followers.
+    """
+    with app.app_context():
+        if not profile_username:
+            top = db.session.query(followers.c.followed_id, func.count().label('n')) \
+                .group_by(followers.c.followed_id).order_by(db.desc('n')).first()
+            if top is None:
+                sys.exit('No follower data found. Run `flask seed` first.')
+            profile_username = db.session.get(User, top[0]).username
+        if not username:
+            profile_user = User.query.filter_by(username=profile_username).first()
+            follower = profile_user.followers.first()
+            username = follower.username if follower else profile_username
+        dataset = {
+            'users': db.session.query(func.count(User.id)).scalar(),
+            'posts': db.session.query(func.count(Post.id)).scalar(),
+        }
+    return username, profile_username, dataset
+
+
+def build_endpoints(username, profile_username):
+    """The routes we track, as (name, path) pairs."""
+    return [
+        ('feed', '/feed'),
+        ('direct_inbox', '/direct_inbox'),
+        ('profile', f'/profile/{profile_username}'),
+        ('search_users', '/api/search_users?' + urllib.parse.urlencode({'query': username[:5]})),
+    ]
+
+
+def run_test_client(app, endpoints, username, password, iterations, warmup):
+    """Times each endpoint in-process and counts the SQL it issues."""
+    results = {}
+    client = app.test_client()
+    response = client.post('/login', data={'username': username, 'password': password})
+    if response.status_code != 302:
+        sys.exit(f'Login as {username} failed with status {response.status_code}.')
+
+    query_count = [0]
+
+    def count_query(*args):
+        query_count[0] += 1
+
+    # Only hold a context long enough to reach the engine. Requests must run
+    # outside it, otherwise Flask reuses the context and the logged-in user
+    # and session identity map carry over, hiding queries from the counts.
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count_query)
+    try:
+        for name, path in endpoints:
+            for _ in range(warmup):
+                client.get(path)
+
+            timings = []
+            queries = []
+            for _ in range(iterations):
+                query_count[0] = 0
+                start = time.perf_counter()
+                response = client.get(path)
+                timings.append((time.perf_counter() - start) * 1000)
+                queries.append(query_count[0])
+                if response.status_code != 200:
+                    sys.exit(f'{path} returned {response.status_code}.')
+
+            # tracemalloc slows everything down, so memory is measured in a
+            # separate request instead of skewing the latency samples.
+            tracemalloc.start()
+            client.get(path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            results[name] = _summarize(timings)
+            results[name]['queries_per_request'] = max(queries)
+            results[name]['peak_memory_kb'] = round(peak / 1024, 1)
+            print(f"  [test_client] {name:<14} p50={results[name]['p50_ms']}ms "
+                  f"p95={results[name]['p95_ms']}ms queries={results[name]['queries_per_request']}")
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_query)
+    return results
+
+
+def _wait_for_port(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def start_gunicorn(port, extra_args, env=None):
+    """Starts gunicorn with the production config, bound to a local port."""
+    command = ['gunicorn', '--config', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+               *extra_args, 'run:app']
+    env = {**os.environ, 'GUNICORN_ACCESS_LOG': '', **(env or {})}
+    process = subprocess.Popen(command, cwd=basedir, env=env)
+    if not _wait_for_port('127.0.0.1', port, timeout=60):
+        process.terminate()
+        sys.exit('gunicorn did not start within 60 seconds.')
+    return process
+
+
+def _logged_in_opener(base_url, username, password):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    login_data = urllib.parse.urlencode({'username': username, 'password': password}).encode()
+    opener.open(base_url + '/login', data=login_data).read()
+    return opener
+
+
+def compare_server_modes(modes, port, username, password, path, concurrency, duration):
+    """
+    Starts gunicorn once per worker class and records how long it takes to
+    serve its first request, then how many requests per second it handles
+    with `concurrency` clients hitting `path` for `duration` seconds.
+    """
+    results = {}
+    base_url = f'http://127.0.0.1:{port}'
+    for mode in modes:
+        if mode == 'gevent' and importlib.util.find_spec('gevent') is None:
+            results[mode] = {'skipped': 'gevent is not installed'}
+            print(f'  [servers]     {mode:<8} skipped, gevent is not installed')
+            continue
+
+        start = time.perf_counter()
+        server = start_gunicorn(port, [], env={'GUNICORN_WORKER_CLASS': mode})
+        try:
+            # The port opens before the workers are ready, so wait for a real response.
+            ready_deadline = time.monotonic() + 60
+            while True:
+                try:
+                    urllib.request.urlopen(base_url + '/login').read()
+                    break
+                except OSError:
+                    if server.poll() is not None:
+                        sys.exit(f'gunicorn exited while starting in {mode} mode.')
+                    if time.monotonic() > ready_deadline:
+                        sys.exit(f'gunicorn did not serve /login within 60 seconds in {mode} mode.')
+                    time.sleep(0.05)
+            startup_s = time.perf_counter() - start
+
+            opener = _logged_in_opener(base_url, username, password)
+            deadline = time.monotonic() + duration
+
+            def client_loop():
+                timings, errors = [], 0
+                while time.monotonic() < deadline:
+                    request_start = time.perf_counter()
+                    try:
+                        with opener.open(base_url + path) as response:
+                            response.read()
+                        timings.append((time.perf_counter() - request_start) * 1000)
+                    except OSError:
+                        errors += 1
+                return timings, errors
+
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                outcomes = list(pool.map(lambda _: client_loop(), range(concurrency)))
+        finally:
+            server.terminate()
+            server.wait()
+
+        timings = [t for client_timings, _ in outcomes for t in client_timings]
+        results[mode] = _summarize(timings) if timings else {'samples': 0}
+        results[mode]['errors'] = sum(errors for _, errors in outcomes)
+        results[mode]['startup_s'] = round(startup_s, 3)
+        results[mode]['throughput_rps'] = round(len(timings) / duration, 1)
+        print(f"  [servers]     {mode:<8} startup={results[mode]['startup_s']}s "
+              f"throughput={results[mode]['throughput_rps']} req/s errors={results[mode]['errors']}")
+    return results
+
+
+def run_http(base_url, endpoints, username, password, iterations, warmup):
+    """Times each endpoint over real HTTP requests with a logged-in session."""
+    results = {}
+    opener = _logged_in_opener(base_url, username, password)
+
+    for name, path in endpoints:
+        url = base_url + path
+        for _ in range(warmup):
+            opener.open(url).read()
+
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            with opener.open(url) as response:
+                response.read()
+                # A redirect back to /login means the session was lost.
+                if response.status != 200 or '/login' in response.geturl():
+                    sys.exit(f'{path} did not return a logged-in 200 response.')
+            timings.append((time.perf_counter() - start) * 1000)
+
+        results[name] = _summarize(timings)
+        print(f"  [http]        {name:<14} p50={results[name]['p50_ms']}ms p95={results[name]['p95_ms']}ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the main VidFlow routes.')
+    parser.add_argument('--mode', choices=['test-client', 'http', 'both', 'servers'], default='test-client',
+                        help='"servers" compares startup time and throughput of the gunicorn worker classes.')
+    parser.add_argument('--output', default='bench_results.json', help='Where to write the JSON report.')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--username', help='Account to log in as. Defaults to a follower of --profile-username.')
+    parser.add_argument('--password', default=SEED_PASSWORD)
+    parser.add_argument('--profile-username', help='Profile to load. Defaults to the most followed user.')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000',
+                        help='Server to hit in http mode when --gunicorn is not used.')
+    parser.add_argument('--gunicorn', action='store_true', help='Start a gunicorn server for http mode.')
+    parser.add_argument('--gunicorn-port', type=int, default=8765)
+    parser.add_argument('--gunicorn-args', default='', help='Extra gunicorn arguments, e.g. "--timeout 30". Set workers and '
+                             'threads with GUNICORN_WORKERS / GUNICORN_THREADS instead.')
+    parser.add_argument('--server-modes', default='sync,gthread,gevent',
+                        help='Comma-separated worker classes to compare in servers mode.')
+    parser.add_argument('--load-path', default='/feed', help='Route to load-test in servers mode.')
+    parser.add_argument('--concurrency', type=int, default=16, help='Parallel clients in servers mode.')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds of load per worker class.')
+    args = parser.parse_args()
+
+    app = create_app()
+    username, profile_username, dataset = resolve_targets(app, args.username, args.profile_username)
+    endpoints = build_endpoints(username, profile_username)
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+            'dataset': dataset,
+            'username': username,
+            'profile_username': profile_username,
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+        },
+    }
+
+    if args.mode in ('test-client', 'both'):
+        report['test_client'] = run_test_client(app, endpoints, username, args.password,
+                                                args.iterations, args.warmup)
+
+    if args.mode in ('http', 'both'):
+        server = None
+        base_url = args.base_url.rstrip('/')
+        if args.gunicorn:
+            server = start_gunicorn(args.gunicorn_port, args.gunicorn_args.split())
+            base_url = f'http://127.0.0.1:{args.gunicorn_port}'
+        try:
+            report['http'] = run_http(base_url, endpoints, username, args.password,
+                                      args.iterations, args.warmup)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+        if server is not None:
+            # ru_maxrss covers reaped descendants, i.e. the largest gunicorn process (KB on Linux).
+            report['http_server'] = {'peak_rss_kb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss}
+
+    if args.mode == 'servers':
+        report['meta']['concurrency'] = args.concurrency
+        report['meta']['duration_s'] = args.duration
+        report['meta']['load_path'] = args.load_path
+        report['servers'] = compare_server_modes(args.server_modes.split(','), args.gunicorn_port,
+                                                 username, args.password, args.load_path,
+                                                 args.concurrency, args.duration)
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
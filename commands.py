@@ -0,0 +1,239 @@
+import random
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func
+
+from app import db, bcrypt
+from app.models import User, Post, Like, Comment, Story, Message, followers
+
+# Preset data set sizes for the `flask seed` command. Use --users to pick any
+# other size.
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+# Every seeded account shares this password so the benchmark harness can log
+# in as any of them. It is hashed once, because bcrypt is deliberately slow.
+SEED_PASSWORD = 'benchmark'
+
+
+def _bulk_insert(table, rows, batch_size):
+    """
+    Inserts rows from an iterable into `table` in executemany batches.
+    Rows are produced lazily, so even the 1M-user graph never sits in memory.
+    Returns the number of rows inserted.
+    """
+    batch = []
+    total = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.session.execute(table.insert(), batch)
+            db.session.commit()
+            total += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(table.insert(), batch)
+        db.session.commit()
+        total += len(batch)
+    return total
+
+
+def _power_law_count(rng, minimum, maximum, alpha):
+    """Draws an integer from a Pareto distribution clamped to [minimum, maximum]."""
+    return min(maximum, int(minimum * rng.paretovariate(alpha)))
+
+
+def _random_timestamp(rng, now, max_age):
+    return now - timedelta(seconds=rng.randint(0, int(max_age.total_seconds())))
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """
+    Creates any database tables and indexes that don't exist yet.
+    Run this once per deploy, before starting the server, so workers don't
+    have to touch the schema while booting. startup.txt also runs it on boot,
+    but a failure there is only logged and the server starts anyway.
+    """
+    db.create_all()
+    # create_all skips tables that already exist, so add indexes that were
+    # introduced after a table was first created.
+    for table in db.metadata.tables.values():
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    click.echo('Database tables are up to date.')
+
+
+@click.command('seed')
+@click.option('--scale', type=click.Choice(list(SCALES)), default='10k', show_default=True,
+              help='Preset number of users to generate.')
+@click.option('--users', type=click.IntRange(min=1), default=None, help='Exact number of users (overrides --scale).')
+@click.option('--creator-ratio', type=click.FloatRange(0, 1, min_open=True), default=0.05, show_default=True,
+              help='Fraction of users, taken from the most followed, who are creators.')
+@click.option('--posts-per-creator', type=click.IntRange(min=1), default=20, show_default=True)
+@click.option('--min-following', type=int, default=5, show_default=True,
+              help='Smallest number of accounts a user follows.')
+@click.option('--max-following', type=int, default=1000, show_default=True,
+              help='Largest number of accounts a user follows.')
+@click.option('--messages-per-user', type=int, default=3, show_default=True,
+              help='Average number of direct messages sent by each user.')
+@click.option('--seed', 'random_seed', type=int, default=42, show_default=True,
+              help='Random seed, so the same options always build the same data set.')
+@click.option('--batch-size', type=click.IntRange(min=1), default=5000, show_default=True)
+@with_appcontext
+def seed_command(scale, users, creator_ratio, posts_per_creator, min_following,
+                 max_following, messages_per_user, random_seed, batch_size):
+    """
+    Fills the database with a synthetic social graph for benchmarking.
+
+    Follower counts follow a power law: a handful of accounts are followed by
+    a large share of users, just like real creators. Posts, likes, comments,
+    stories and messages are generated on top of that graph and written with
+    bulk inserts. New rows are appended after any existing data.
+    Run `flask init-db` first to create the tables.
+    """
+    rng = random.Random(random_seed)
+    now = datetime.utcnow()
+    user_count = users if users is not None else SCALES[scale]
+    creator_count = max(1, int(user_count * creator_ratio))
+
+    # Explicit ids let us reference users and posts without reading them back.
+    first_user_id = (db.session.query(func.max(User.id)).scalar() or 0) + 1
+    first_post_id = (db.session.query(func.max(Post.id)).scalar() or 0) + 1
+    user_ids = range(first_user_id, first_user_id + user_count)
+    creator_ids = user_ids[:creator_count]
+    password_hash = bcrypt.generate_password_hash(SEED_PASSWORD).decode('utf-8')
+
+    click.echo(f'Seeding {user_count} users ({creator_count} creators) with seed {random_seed}...')
+
+    def user_rows():
+        for rank, user_id in enumerate(user_ids):
+            yield {
+                'id': user_id,
+                'username': f'user{user_id}',
+                'email': f'user{user_id}@example.com',
+                'password': password_hash,
+                'bio': '',
+                'profile_pic': 'default.jpg',
+                'role': 'creator' if rank < creator_count else 'consumer',
+            }
+
+    total = _bulk_insert(User.__table__, user_rows(), batch_size)
+    click.echo(f'  users:     {total}')
+
+    # Zipf-like popularity: the user at rank r is picked as a followee with
+    # weight 1 / (r + 1). random.choices bisects the cumulative weights, so
+    # each pick is O(log n) even at 1M users.
+    cum_weights = []
+    running = 0.0
+    for rank in range(user_count):
+        running += 1.0 / (rank + 1)
+        cum_weights.append(running)
+
+    def follower_rows():
+        for user_id in user_ids:
+            wanted = min(user_count - 1, _power_law_count(rng, min_following, max_following, 1.5))
+            picks = set(rng.choices(user_ids, cum_weights=cum_weights, k=wanted))
+            picks.discard(user_id)
+            for followed_id in picks:
+                yield {'follower_id': user_id, 'followed_id': followed_id}
+
+    total = _bulk_insert(followers, follower_rows(), batch_size)
+    click.echo(f'  follows:   {total}')
+
+    def post_rows():
+        post_id = first_post_id
+        for creator_id in creator_ids:
+            for _ in range(posts_per_creator):
+                media_type = 'video' if rng.random() < 0.3 else 'image'
+                extension = 'mp4' if media_type == 'video' else 'jpg'
+                yield {
+                    'id': post_id,
+                    'caption': f'Seeded post {post_id}',
+                    'filename': f'seed_{post_id}.{extension}',
+                    'timestamp': _random_timestamp(rng, now, timedelta(days=90)),
+                    'user_id': creator_id,
+                    'media_type': media_type,
+                    'title': f'Post {post_id}',
+                }
+                post_id += 1
+
+    total = _bulk_insert(Post.__table__, post_rows(), batch_size)
+    click.echo(f'  posts:     {total}')
+    # Likes and comments may only point at posts that were really inserted.
+    post_ids = range(first_post_id, first_post_id + total)
+
+    def like_rows():
+        for post_id in post_ids:
+            count = min(user_count, _power_law_count(rng, 1, 5000, 1.2))
+            for user_id in set(rng.choices(user_ids, k=count)):
+                yield {'user_id': user_id, 'post_id': post_id}
+
+    total = _bulk_insert(Like.__table__, like_rows(), batch_size)
+    click.echo(f'  likes:     {total}')
+
+    def comment_rows():
+        for post_id in post_ids:
+            for _ in range(_power_law_count(rng, 1, 200, 2.0) - 1):
+                yield {
+                    'text': 'Seeded comment',
+                    'timestamp': _random_timestamp(rng, now, timedelta(days=90)),
+                    'user_id': rng.choice(user_ids),
+                    'post_id': post_id,
+                }
+
+    total = _bulk_insert(Comment.__table__, comment_rows(), batch_size)
+    click.echo(f'  comments:  {total}')
+
+    def story_rows():
+        # Roughly a third of creators have stories that are still active.
+        for creator_id in creator_ids:
+            if rng.random() < 0.33:
+                for _ in range(rng.randint(1, 3)):
+                    yield {
+                        'filename': f'seed_story_{creator_id}.jpg',
+                        'timestamp': _random_timestamp(rng, now, timedelta(hours=23)),
+                        'user_id': creator_id,
+                    }
+
+    total = _bulk_insert(Story.__table__, story_rows(), batch_size)
+    click.echo(f'  stories:   {total}')
+
+    def message_rows():
+        for user_id in user_ids:
+            for _ in range(rng.randint(0, 2 * messages_per_user)):
+                receiver_id = rng.choice(user_ids)
+                if receiver_id == user_id:
+                    continue
+                yield {
+                    'text': 'Seeded message',
+                    'timestamp': _random_timestamp(rng, now, timedelta(days=30)),
+                    'sender_id': user_id,
+                    'receiver_id': receiver_id,
+                }
+
+    total = _bulk_insert(Message.__table__, message_rows(), batch_size)
+    click.echo(f'  messages:  {total}')
+
+    # PostgreSQL sequences don't advance when ids are inserted explicitly.
+    if db.engine.dialect.name == 'postgresql':
+        for table in ('user', 'post'):
+            db.session.execute(db.text(
+                f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+                f"(SELECT MAX(id) FROM \"{table}\"))"
+            ))
+        db.session.commit()
+
+    click.echo(f"Done. Log in as user{first_user_id} (most followed) with password '{SEED_PASSWORD}'.")
+
+
+def register_commands(app):
+    """Attaches the project's custom CLI commands to the Flask app."""
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(seed_command)
@@ -24,6 +24,16 @@ class Config:
     # Check if the database environment variables are set
     if db_user and db_pass and db_host:
         SQLALCHEMY_DATABASE_URI = f"postgresql://{db_user}:{db_pass}@{db_host}/{db_name}"
+
+        # Connection pool for each server worker. gunicorn.conf.py sets these
+        # to match the worker's threads/greenlets. pool_pre_ping and
+        # pool_recycle replace connections that Azure has silently closed.
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            'pool_pre_ping': True,
+            'pool_recycle': 280,
+        }
     else:
         # Fallback to local SQLite database if environment variables are not set
         SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'instance', 'site.db')
@@ -0,0 +1,104 @@
+# Production gunicorn settings for VidFlow.
+# Start the server with:  gunicorn --config gunicorn.conf.py run:app
+#
+# Every setting can be overridden with an environment variable, so the same
+# file works on a small App Service plan and on a large one. Set workers and
+# threads through GUNICORN_WORKERS / GUNICORN_THREADS, not --workers/--threads
+# on the command line: the database pool below is sized from these values
+# before gunicorn applies command-line overrides.
+#
+# GUNICORN_WORKER_CLASS picks the concurrency model:
+#   gthread (default) - a few processes, each serving several requests on threads.
+#                       A slow upload or query only ties up one thread.
+#   gevent            - cooperative greenlets, for many slow/idle connections.
+#                       Needs `pip install gevent psycogreen`.
+#   sync              - the old one-request-per-process behaviour.
+import logging
+import multiprocessing
+import os
+
+log = logging.getLogger('gunicorn.error')
+
+cpu_count = multiprocessing.cpu_count()
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+if worker_class == 'gevent':
+    # The app is preloaded in the master process, so sockets and psycopg2 have
+    # to be made cooperative before anything imports them.
+    from gevent import monkey
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    except ImportError:
+        # Without psycogreen every PostgreSQL query blocks the whole worker.
+        log.warning('psycogreen is not installed; database calls will block gevent workers.')
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+# gevent workers each juggle many connections, so one per CPU is enough.
+default_workers = cpu_count if worker_class == 'gevent' else cpu_count * 2 + 1
+workers = int(os.environ.get('GUNICORN_WORKERS', default_workers))
+threads = int(os.environ.get('GUNICORN_THREADS', 4 if worker_class == 'gthread' else 1))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 100))
+
+# Load the app once in the master and fork workers from it. Workers boot fast
+# and share the imported code's memory.
+preload_app = True
+
+# Recycle workers now and then so slow leaks can't build up. The jitter stops
+# all workers from restarting at the same moment.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Large video uploads can take a while, so keep the generous old timeout.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 600))
+graceful_timeout = 30
+keepalive = 5
+
+# Set GUNICORN_ACCESS_LOG to an empty string to turn request logging off.
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+
+# Database pools. DB_MAX_CONNECTIONS is the total number of connections the
+# whole server may open; keep it below the database's max_connections (50 on
+# Azure's burstable PostgreSQL tiers, minus a few for admin and init-db).
+# Each worker gets an equal share, kept open up to its request concurrency,
+# with the rest as overflow. config.py reads these when the app is imported,
+# which happens after this file is loaded.
+db_max_connections = int(os.environ.get('DB_MAX_CONNECTIONS', 40))
+connections_per_worker = max(1, db_max_connections // workers)
+if workers > db_max_connections:
+    log.warning('%d workers exceed DB_MAX_CONNECTIONS=%d; each still needs one connection.',
+                workers, db_max_connections)
+
+if worker_class == 'gevent':
+    concurrency = worker_connections
+elif worker_class == 'gthread':
+    concurrency = threads
+else:
+    concurrency = 1
+pool_size = min(concurrency, connections_per_worker)
+os.environ.setdefault('DB_POOL_SIZE', str(pool_size))
+os.environ.setdefault('DB_MAX_OVERFLOW', str(connections_per_worker - pool_size))
+
+
+def on_starting(server):
+    """Refuses to start if --workers/--threads overrode the values the pools were sized for."""
+    if server.cfg.workers != workers or server.cfg.threads != threads:
+        raise RuntimeError(
+            f'Database pools were sized for {workers} workers x {threads} threads, but gunicorn '
+            f'is configured with {server.cfg.workers} x {server.cfg.threads}. Set '
+            f'GUNICORN_WORKERS / GUNICORN_THREADS instead of --workers / --threads.')
+
+
+def post_fork(server, worker):
+    """
+    Makes the worker forget any database connections inherited from the
+    master, so it opens its own. close=False leaves the shared sockets alone;
+    closing them here would break them for the master and sibling workers.
+    """
+    from run import app
+    from app import db
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -11,7 +11,10 @@ def load_user(user_id):
 # between users (for following). It doesn't need its own model class.
 followers = db.Table('followers',
     db.Column('follower_id', db.Integer, db.ForeignKey('user.id')),
-    db.Column('followed_id', db.Integer, db.ForeignKey('user.id'))
+    db.Column('followed_id', db.Integer, db.ForeignKey('user.id')),
+    # Indexes for the follower/following counts and follow checks on profiles.
+    db.Index('ix_followers_follower_followed', 'follower_id', 'followed_id'),
+    db.Index('ix_followers_followed_id', 'followed_id')
 )
 
 class User(db.Model, UserMixin):
@@ -90,6 +93,9 @@ class Post(db.Model):
     likes = db.relationship('Like', backref='post', lazy=True, cascade="all, delete-orphan")
     notifications = db.relationship('Notification', backref='post', lazy=True, cascade="all, delete-orphan")
 
+    # Serves the profile grid: one user's posts, newest first.
+    __table_args__ = (db.Index('ix_post_user_timestamp', 'user_id', 'timestamp'),)
+
     def __repr__(self):
         return f"Post('{self.caption}', '{self.timestamp}')"
 
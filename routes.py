@@ -4,13 +4,16 @@ from datetime import datetime, timedelta
 from flask import (render_template, url_for, flash, redirect, request, Blueprint,
                    current_app, jsonify)
 from flask_login import login_user, current_user, logout_user, login_required
-from sqlalchemy import or_, desc
+from sqlalchemy import or_, and_, desc, func, select, exists
 from sqlalchemy.orm import joinedload, subqueryload
 from app import db
-from app.models import User, Post, Like, Comment, Story, Message, Notification
+from app.models import User, Post, Like, Comment, Story, Message, Notification, followers
 
 main = Blueprint('main', __name__)
 
+# Number of posts in each page of the profile grid.
+PROFILE_PAGE_SIZE = 12
+
 # --- Helper Functions ---
 def is_video(filename):
     return '.' in filename and \
@@ -95,12 +98,67 @@ def view_stories(username):
 
     return render_template('story_detail.html', stories=serialized_stories, start_index=start_index, author=user)
 
+def profile_grid_page(user_id, cursor=None):
+    """
+    Returns one page of a user's post grid, newest first, plus the cursor for
+    the next page (None on the last page). Only the columns a tile needs are
+    loaded, not full Post objects. The cursor is "<timestamp>|<post id>" of the
+    last tile, so each page is an index range scan rather than an OFFSET.
+    Raises ValueError for a malformed cursor.
+    """
+    query = db.session.query(Post.id, Post.filename, Post.media_type, Post.timestamp) \
+        .filter(Post.user_id == user_id)
+    if cursor:
+        timestamp, post_id = cursor.split('|')
+        timestamp, post_id = datetime.fromisoformat(timestamp), int(post_id)
+        query = query.filter(or_(Post.timestamp < timestamp,
+                                 and_(Post.timestamp == timestamp, Post.id < post_id)))
+    rows = query.order_by(Post.timestamp.desc(), Post.id.desc()).limit(PROFILE_PAGE_SIZE + 1).all()
+
+    next_cursor = None
+    if len(rows) > PROFILE_PAGE_SIZE:
+        rows = rows[:PROFILE_PAGE_SIZE]
+        next_cursor = f"{rows[-1].timestamp.isoformat()}|{rows[-1].id}"
+    return rows, next_cursor
+
 @main.route('/profile/<string:username>')
 @login_required
 def profile(username):
-    user = User.query.filter_by(username=username).first_or_404()
-    posts = Post.query.filter_by(author=user).order_by(Post.timestamp.desc()).all()
-    return render_template('profile.html', user=user, posts=posts)
+    # The user, their header stats and whether we follow them, in one query.
+    post_count = select(func.count(Post.id)).where(Post.user_id == User.id).scalar_subquery()
+    followers_count = select(func.count()).select_from(followers) \
+        .where(followers.c.followed_id == User.id).scalar_subquery()
+    following_count = select(func.count()).select_from(followers) \
+        .where(followers.c.follower_id == User.id).scalar_subquery()
+    is_following = exists().where(followers.c.follower_id == current_user.id,
+                                  followers.c.followed_id == User.id)
+    row = db.session.query(User,
+                           post_count.label('post_count'),
+                           followers_count.label('followers_count'),
+                           following_count.label('following_count'),
+                           is_following.label('is_following')) \
+        .filter(User.username == username).first_or_404()
+
+    posts, next_cursor = profile_grid_page(row.User.id)
+    return render_template('profile.html', user=row.User, stats=row, posts=posts, next_cursor=next_cursor)
+
+@main.route('/api/<username>/posts')
+@login_required
+def get_profile_posts(username):
+    user_id = db.session.query(User.id).filter_by(username=username).scalar()
+    if user_id is None:
+        return jsonify({'status': 'error', 'message': 'User not found.'}), 404
+    try:
+        posts, next_cursor = profile_grid_page(user_id, request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid cursor.'}), 400
+    posts_data = [{
+        'id': post.id,
+        'media_type': post.media_type,
+        'media_url': url_for('static', filename='uploads/' + post.filename),
+        'detail_url': url_for('main.post_detail', post_id=post.id),
+    } for post in posts]
+    return jsonify({'posts': posts_data, 'next_cursor': next_cursor})
 
 @main.route('/post/<int:post_id>')
 @login_required